@@ -6,11 +6,17 @@ the amara module. This includes the submodules:
     - core (without core.extraction)
     - datasets
     - visuals
+    - static
+    - utils
+    - machinelearning.timeseries (TimeSeriesDataset)
 """
 
 
 import os
+import pickle
+import tempfile
 import unittest
+from configparser import ConfigParser, NoSectionError
 
 from importlib import reload
 import sys; sys.path.append(os.path.abspath('../../amara-dev'))
@@ -20,9 +26,14 @@ import pandas as pd
 import numpy as np
 
 from amara.core.wrappers import DirectoryWrapper
+from amara.core.utils import ObjectStorage
+from amara.utils import ConfigFile
+from amara.machinelearning.timeseries.TimeSeriesDataset import TimeSeriesDataset
 
 from amara.core.googleapi import SheetConnection
 
+from amara.static.groupings import bin_nights, bin_booking_window, tax_for_year
+
 
 RAW_DATA_FOLDER: os.PathLike = '../../Raw Data'
 SAMPLE_FILES: dict[str, os.PathLike] = {}
@@ -42,7 +53,139 @@ class TestUtility(unittest.TestCase):
         # creation
         conn = SheetConnection(scopes=['https://www.googleapis.com/auth/spreadsheets.readonly'],
                                spreadsheet_id='')
+
+    def test_bin_lookup(self) -> None:
+        # bin boundaries are inclusive on both sides
+        np.testing.assert_array_equal(bin_nights(np.array([0, 1, 2, 3, 6, 7, 14, 15, 1000])),
+                                      ['Dayuse', '1 day', '2 days', '3 - 6 days', '3 - 6 days', '7 - 14 days', '7 - 14 days', '> 14 days', '> 14 days'])
+        
+        # overlapping 7 day bound goes to the first bin
+        np.testing.assert_array_equal(bin_booking_window(np.array([-5, -1, 0, 3, 7, 8, 13, 14, 29, 30])),
+                                      ['Early Check-In', 'Early Check-In', 'Same day', '3 - 6 days', '3 - 6 days', '7 - 13 days', '7 - 13 days', '14 - 29 days', '14 - 29 days', '> 29 days'])
+        np.testing.assert_array_equal(tax_for_year(np.array([2000, 2022, 2023, 2024, 2030])), [1.177, 1.177, 1.188, 1.199, 1.199])
+
+        # values in no bin are NaN
+        self.assertTrue(pd.isna(bin_nights(np.array([-3, -0.5, 2.5, 6.5, 14.5, np.nan]))).all())
+        self.assertTrue(pd.isna(bin_booking_window(np.array([-0.5, 0.5, 29.5, np.nan]))).all())
+        self.assertTrue(np.isnan(tax_for_year(np.array([2022.5, np.nan]))).all())
     
 
+    def test_last_valid_year(self) -> None:
+        # unified range is 2020, the closest earlier valid year 2019 is picked
+        dates_1 = pd.date_range('2016-01-01', '2022-12-31', freq='D')
+        dates_2 = pd.date_range('2020-01-01', '2020-12-31', freq='D')
+        df_1 = pd.DataFrame({'date': dates_1.strftime('%d/%m/%Y'), 'a': np.arange(len(dates_1), dtype=np.float64)})
+        df_2 = pd.DataFrame({'date': dates_2.strftime('%d/%m/%Y'), 'b': np.ones(len(dates_2))})
+        TSDataset = TimeSeriesDataset(datasets=[df_1, df_2], datetime_cols=['date', 'date'])
+
+        last_year = TSDataset.last_valid_year(0)
+        self.assertTrue((last_year.index.year == 2019).all())
+        self.assertEqual(last_year.index[0], pd.Timestamp('2019-01-01'))
+        self.assertEqual(last_year.index[-1], pd.Timestamp('2019-12-31'))
+
+        # returned data is a copy
+        last_year['a'] *= 0
+        self.assertTrue((TSDataset.last_valid_year(0)['a'] != 0).all())
+
+    def test_consolidate_dataset_ids(self) -> None:
+        dates = pd.date_range('2020-01-01', '2020-03-31', freq='D')
+        df_1 = pd.DataFrame({'date': dates.strftime('%d/%m/%Y'), 'a': np.arange(len(dates), dtype=np.float64)})
+        df_2 = pd.DataFrame({'date': dates.strftime('%d/%m/%Y'), 'b': np.ones(len(dates))})
+        TSDataset = TimeSeriesDataset(datasets=[df_1, df_2], datetime_cols=['date', 'date'])
+
+        # ids are 0-indexed
+        for dataset_ids in ([1, 2], [-1, 0]):
+            with self.assertRaises(ValueError):
+                TSDataset.consolidate(dataset_ids=dataset_ids, columns=[['a'], ['b']])
+
+        TSDataset.consolidate(dataset_ids=[0, 1], columns=[['a'], ['b']])
+        self.assertEqual(TSDataset.data_.columns.tolist(), ['a', 'b'])
+
+    def test_config_file(self) -> None:
+        text = (
+            '[DEFAULT]\n'
+            'Shared = default\n'
+            '\n'
+            '# comment\n'
+            '[Section-One]\n'
+            'Field_1 = data_1\n'
+            'field_2: data 2\n'
+            '; comment\n'
+            '[Section-Two]\n'
+            'shared = overridden\n'
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'config.cfg')
+            with open(filepath, 'w') as file:
+                file.write(text)
+
+            # same sections and values as ConfigParser
+            configparser = ConfigParser()
+            configparser.read(filepath)
+            config = ConfigFile(filepath)
+
+            self.assertEqual(config.sections, configparser.sections())
+            for section in configparser.sections():
+                self.assertEqual(config.get(section), dict(configparser.items(section)))
+            with self.assertRaises(NoSectionError):
+                config.get('Section-Three')
+
+            # returned sections are copies of the cached ones
+            config.get('Section-One')['field_1'] = 'changed'
+            self.assertEqual(ConfigFile(filepath).get('Section-One')['field_1'], 'data_1')
+
+            # reparsed if the size changes
+            with open(filepath, 'w') as file:
+                file.write(text.replace('data_1', 'data_one'))
+            self.assertEqual(ConfigFile(filepath).get('Section-One')['field_1'], 'data_one')
+
+            # reparsed if only the modified time changes
+            stat = os.stat(filepath)
+            with open(filepath, 'w') as file:
+                file.write(text.replace('data_1', 'data_two'))
+            os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(os.stat(filepath).st_size, stat.st_size)
+            self.assertEqual(ConfigFile(filepath).get('Section-One')['field_1'], 'data_two')
+
+            ConfigFile.clear_cache()
+
+    def test_object_storage_pickle(self) -> None:
+        storage = ObjectStorage(max_caches=2)
+        for i in range(3):
+            storage.add_cache(number=i)
+
+        with tempfile.TemporaryDirectory() as directory:
+            # gzip compressed round trip
+            filepath = os.path.join(directory, 'storage.pkl')
+            storage.to_pickle(filepath)
+            with open(filepath, 'rb') as file:
+                self.assertEqual(file.read(2), b'\x1f\x8b')
+
+            loaded = ObjectStorage.from_pickle(filepath)
+            self.assertEqual([cache.number for cache in loaded.history], [1, 2])
+
+            # legacy uncompressed pickle, caches in a list and no signature keys
+            legacy = ObjectStorage.__new__(ObjectStorage)
+            legacy.__dict__.update({
+                '_ObjectStorage__storage': [cache for cache in storage.history],
+                '_ObjectStorage__max_caches': 2,
+                '_ObjectStorage__cache_signature': {'number': int}
+            })
+            legacy_filepath = os.path.join(directory, 'legacy.pkl')
+            with open(legacy_filepath, 'wb') as file:
+                pickle.dump(legacy, file)
+
+            loaded = ObjectStorage.from_pickle(legacy_filepath)
+            self.assertIsInstance(loaded.history, list)
+            self.assertEqual([cache.number for cache in loaded.history], [1, 2])
+
+            # signature and max caches still apply after loading
+            loaded.add_cache(number=3)
+            self.assertEqual([cache.number for cache in loaded.history], [2, 3])
+            with self.assertRaises(ValueError):
+                loaded.add_cache(colour='blue')
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
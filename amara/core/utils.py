@@ -7,11 +7,17 @@ and wrapping.
 from __future__ import annotations
 
 import os
+import gzip
 import pickle
+from collections import deque
 from typing import Any
 from datetime import datetime
 
 
+# leading bytes of every gzip stream, tells compressed storages apart from legacy plain pickles
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
 class ObjectStorage:
     """
     This class provides multiple object storage for general utility with `pickle`. 
@@ -52,10 +58,20 @@ class ObjectStorage:
             pruned.
         """
 
-        self.__storage: list[_Cache] = []
+        # bounded, oldest caches are dropped automatically past max_caches
+        self.__storage: deque[_Cache] = deque(maxlen=max_caches)
         self.__max_caches = max_caches
 
         self.__cache_signature: dict[str, type] = None
+        self.__signature_keys: frozenset[str] = None
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # storages pickled before caches were kept in a bounded deque or signature keys were kept
+        self.__dict__.update(state)
+        if not isinstance(self.__storage, deque):
+            self.__storage = deque(self.__storage, maxlen=self.__max_caches)
+        if '_ObjectStorage__signature_keys' not in state:
+            self.__signature_keys = None if self.__cache_signature is None else frozenset(self.__cache_signature)
 
     @property
     def latest(self) -> _Cache:
@@ -71,7 +87,7 @@ class ObjectStorage:
         All cached data storage objects.
         """
 
-        return self.__storage
+        return list(self.__storage)
     
     def add_cache(self, **kwargs: dict[str, Any]) -> None:
         r"""
@@ -111,12 +127,13 @@ class ObjectStorage:
             # if valid kwargs, create _Cache object from it, update signature
             self.__storage.append(_Cache(**kwargs))
             self.__cache_signature = {key: type(value) for key, value in kwargs.items()}
+            self.__signature_keys = frozenset(self.__cache_signature)
         
         # if signature set, check kwargs against signature
         else:
             for key, value in kwargs.items():
                 # check attribute name
-                if key not in list(self.__cache_signature.keys()):
+                if key not in self.__signature_keys:
                     raise ValueError(f'Keyword argument "{key}" does not exist in this ObjectStorage object\'s cache signature. Valid keyword arguments are: {list(self.__cache_signature.keys())}.')
 
                 # check value type
@@ -126,10 +143,6 @@ class ObjectStorage:
             # if signatures match, add
             self.__storage.append(_Cache(**kwargs))
 
-        # prune caches if exceed max caches
-        if len(self.__storage) > self.__max_caches:
-            self.__storage.pop(0)
-
     def display(self) -> None:
         """
         Displays the current storage structure in a more human-readable form.
@@ -157,8 +170,8 @@ class ObjectStorage:
     def to_pickle(self, filepath: os.PathLike) -> None:
         """
         This function is a wrapper for the built-in module pickle's `pickle.dump` 
-        function. Pickles the whole `ObjectStorage` and saves it at the `filepath` 
-        specified.
+        function. Pickles the whole `ObjectStorage` with the highest pickle protocol, 
+        gzip compressed, and saves it at the `filepath` specified.
 
         Parameters
         ----------
@@ -175,15 +188,15 @@ class ObjectStorage:
         `pickle.dump` : Saves a python object to a file.
         """
 
-        with open(filepath, 'wb') as file:
-            pickle.dump(self, file)
+        with gzip.open(filepath, 'wb', compresslevel=3) as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
 
     @classmethod
     def from_pickle(cls, filepath: os.PathLike) -> ObjectStorage:
         """
         This function is a wrapper for the built-in module pickle's `pickle.load` 
         function. Loads the `ObjectStorage` saved at the filepath and returns
-        it.
+        it, compressed or legacy uncompressed.
 
         Parameters
         ----------
@@ -205,6 +218,11 @@ class ObjectStorage:
         """
 
         with open(filepath, 'rb') as file:
+            if file.read(len(_GZIP_MAGIC)) != _GZIP_MAGIC:
+                file.seek(0)
+                return pickle.load(file)
+            
+        with gzip.open(filepath, 'rb') as file:
             return pickle.load(file)
 
 
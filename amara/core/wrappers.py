@@ -146,8 +146,10 @@ class ExcelFileWrapper:
         :func:`pd.ExcelWriter` : Interface to sheet saving with Python and Pandas
         """
 
-        # open excel file with engine
-        with pd.ExcelWriter(self.__filepath, engine='xlsxwriter') as writer:
+        # open excel file with engine once for all sheets, url-like strings are written as plain text
+        # instead of being scanned into hyperlinks, constant_memory is not used as pandas writes 
+        # cells column by column and that mode drops cells of rows already written
+        with pd.ExcelWriter(self.__filepath, engine='xlsxwriter', engine_kwargs={'options': {'strings_to_urls': False}}) as writer:
             for i, data in enumerate(datas):
                 data.to_excel(writer, sheet_name=sheet_names[i], index=False) 
 
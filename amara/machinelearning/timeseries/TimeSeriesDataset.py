@@ -7,9 +7,8 @@ from dateutil.relativedelta import relativedelta
 from dataclasses import dataclass
 from calendar import isleap
 
+import numpy as np
 import pandas as pd
-from statsmodels.tsa.statespace.tools import diff
-from statsmodels.tsa.stattools import adfuller
 
 from amara.machinelearning.timeseries.preprocessing import create_datetime_index
 from amara._errors import NotInitialisedError
@@ -21,6 +20,19 @@ class _DateRange:
     start_date: datetime
     end_date: datetime
 
+def _range_slice(data: T, start_date: datetime, end_date: datetime) -> T:
+    """
+    Slices `data` to dates between `start_date` and `end_date`, inclusive of both. Uses
+    positional slicing on a sorted datetime index, falls back to a boolean mask otherwise.
+    """
+
+    if not data.index.is_monotonic_increasing:
+        return data.loc[(data.index >= start_date) & (data.index <= end_date)]
+
+    start = data.index.searchsorted(start_date, side='left')
+    end = data.index.searchsorted(end_date, side='right')
+    return data.iloc[start:end]
+
 class TimeSeriesDataset:
     """
     Handles creation of a time series dataset suitable for time series forecasting 
@@ -89,25 +101,49 @@ class TimeSeriesDataset:
         self.__class_name = self.__class__.__name__
         
         # basic init
-        self.__initial_datasets = [df.copy(deep=True) for df in datasets]
-        self.__datasets = [df.copy(deep=True) for df in datasets]
+        self.__initial_datasets: list[pd.DataFrame] = [None] * len(datasets)
+        self.__datasets: list[pd.DataFrame] = [None] * len(datasets)
         self.__datetime_cols = datetime_cols
-        self.__valid_years: list[list[int]] = []
+        self.__valid_years: list[np.ndarray] = []
 
-        # consolidated data
-        self.__consolidated_data = None
+        # years to remove, normalised once for all datasets
+        removed = np.unique(np.asarray(removed_years if removed_years is not None else (), dtype=np.int64))
+
+        # consolidated data, kept as raw column arrays and only built into a DataFrame on access
+        self.__consolidated_columns: dict[str, np.ndarray] = None
+        self.__consolidated_index: pd.DatetimeIndex = None
+        self.__consolidated_data: pd.DataFrame = None
 
         # make datetime columns for datasets passed, remove years if needed
-        for i, data in enumerate(self.__datasets):
-            self.__datasets[i] = create_datetime_index(data, self.__datetime_cols[i], format='auto', drop=True)
-            self.__initial_datasets[i] = create_datetime_index(data, self.__datetime_cols[i], format='auto', drop=True)
+        for i, data in enumerate(datasets):
+            # shares buffers with the frame passed in until copied below
+            data = create_datetime_index(data, self.__datetime_cols[i], format='auto', drop=True, copy=False)
+
+            # date range unification and slicing rely on sorted dates
+            if not data.index.is_monotonic_increasing:
+                raise ValueError(f'Dataset {i} is not sorted by its datetime column "{self.__datetime_cols[i]}".')
+
+            if removed.size > 0:
+                years = data.index.year.to_numpy()
 
-            if removed_years is not None:
-                for year in removed_years:
-                    self.__datasets[i] = self.__datasets[i].loc[self.__datasets[i].index.year != year]
-                    self.__initial_datasets[i] = self.__initial_datasets[i].loc[self.__initial_datasets[i].index.year != year]
+                # few years are cheaper as chained comparisons than a hashed lookup
+                if removed.size <= 4:
+                    mask = np.ones(years.shape, dtype=bool)
+                    for year in removed:
+                        mask &= years != year
+                else:
+                    mask = ~np.isin(years, removed)
 
-            self.__valid_years.append(self.__datasets[i].index.year.unique().tolist())
+                # boolean selection already copies
+                data = data.loc[mask]
+            else:
+                data = data.copy()
+
+            # separate copies, unified slices are views and callbacks may edit them in place
+            self.__datasets[i] = data
+            self.__initial_datasets[i] = data.copy()
+
+            self.__valid_years.append(np.asarray(self.__datasets[i].index.year.unique(), dtype=np.int32))
 
         # unify date range for all datasets
         self.__date_range = _DateRange(datetime.min, datetime.max)
@@ -125,7 +161,7 @@ class TimeSeriesDataset:
 
         # slice datasets to only include dates in date range
         for i, data in enumerate(self.__datasets):
-            self.__datasets[i] = data.loc[(data.index >= self.__date_range.start_date) & (data.index <= self.__date_range.end_date)]
+            self.__datasets[i] = _range_slice(data, self.__date_range.start_date, self.__date_range.end_date)
 
         self.__target = None
         self.__forecast_date = None
@@ -136,7 +172,8 @@ class TimeSeriesDataset:
     def data_(self) -> pd.DataFrame:
         """
         Consolidated data suitable for input to a time series forecasting model. Only
-        available after call to `TimeSeriesDataset.consolidate`.
+        available after call to `TimeSeriesDataset.consolidate`. Returned as a copy, 
+        use `TimeSeriesDataset.append` to add data to the dataset itself.
 
         Raises
         ------
@@ -144,11 +181,22 @@ class TimeSeriesDataset:
             Only available after call to `TimeSeriesDataset.consolidate`.
         """
 
+        return self._data_view().copy()
+
+    def _data_view(self) -> pd.DataFrame:
+        """
+        Consolidated data without a defensive copy, built once and reused until the 
+        consolidated columns change. For internal read-only use.
+        """
+
         # check if data has been consolidated
-        if self.__consolidated_data is None:
+        if self.__consolidated_columns is None:
             raise NotInitialisedError(f'{self.__class_name}.data_ has not been initialised. Call {self.__class_name}.consolidated with appropriate arguments.')
-        
-        return self.__consolidated_data.copy(deep=True)
+
+        if self.__consolidated_data is None:
+            self.__consolidated_data = pd.DataFrame(self.__consolidated_columns, index=self.__consolidated_index, copy=False)
+
+        return self.__consolidated_data
 
     @property
     def date_range(self) -> _DateRange:
@@ -214,7 +262,7 @@ class TimeSeriesDataset:
         `TimeSeriesDataset.split`.
         """
 
-        if self.__consolidated_data is None or self.__train_data is None or self.__forecast_data is None:
+        if self.__consolidated_columns is None or self.__train_data is None or self.__forecast_data is None:
             raise NotInitialisedError(f'{self.__class_name}.forecast_date_ has not been initialised. Call {self.__class_name}.consolidated and {self.__class_name}.split with appropriate arguments.')
 
         return self.__forecast_date.strftime('%d-%m-%Y')
@@ -234,39 +282,31 @@ class TimeSeriesDataset:
         """
 
         # pull info for dataset queried
-        data = self.__initial_datasets[dataset_id].copy(deep=True)
-        data_valid_years = self.__valid_years[dataset_id][::-1]
-
-        LY_start_year = self.__date_range.start_date.year - 1
-        LY_end_year = self.__date_range.end_date.year - 1
-
-        # get date bounds
-        valid_bounds_found: bool = False
-        for _ in range(len(data_valid_years)):
-            # go back one year for min and max unified date till valid pair
-            LY_start_year -= 1
-            LY_end_year -= 1
+        data = self.__initial_datasets[dataset_id]
+        data_valid_years = self.__valid_years[dataset_id]
 
-            if LY_start_year - 1 in data_valid_years and LY_end_year - 1 in data_valid_years:
-                # apply minus 1
-                LY_start_year -= 1
-                LY_end_year -= 1
+        start_year = self.__date_range.start_date.year
+        end_year = self.__date_range.end_date.year
 
-                valid_bounds_found = True
-                break
+        # get date bounds, latest earlier start year whose end year is also valid
+        candidate_years = data_valid_years[data_valid_years < start_year]
+        candidate_years = candidate_years[np.isin(candidate_years + (end_year - start_year), data_valid_years)]
 
-        if not valid_bounds_found:
+        if candidate_years.size == 0:
             raise Exception(f'No last valid year found for unified boundaries "{self.__date_range.start_date.year}" - "{self.__date_range.end_date.year}"')
+
+        LY_start_year = int(candidate_years.max())
+        LY_end_year = LY_start_year + (end_year - start_year)
         
         # get data for that date range
         LY_date_range = _DateRange(start_date=self.__date_range.start_date.replace(year=LY_start_year),
                                    end_date=self.__date_range.end_date.replace(year=LY_end_year))
-        LY_data = data.loc[(data.index >= LY_date_range.start_date) & (data.index <= LY_date_range.end_date)]
+        LY_data = _range_slice(data, LY_date_range.start_date, LY_date_range.end_date)
 
-        # return columns if passed
+        # return columns if passed, copied as the slice is a view of the initial dataset
         if columns is not None:
-            return LY_data[columns]
-        return LY_data
+            return LY_data[columns].copy()
+        return LY_data.copy()
     
     def apply(self, __callback: Callable[..., T], input_ids: list[int], use_initial: bool = False, unify: bool = True) -> T:
         """
@@ -303,7 +343,7 @@ class TimeSeriesDataset:
             return __callback(*datasets)
         
         return_value = __callback(*datasets)
-        return return_value.loc[(return_value.index >= self.__date_range.start_date) & (return_value.index <= self.__date_range.end_date)]
+        return _range_slice(return_value, self.__date_range.start_date, self.__date_range.end_date)
         
     def consolidate(self, dataset_ids: list[int], columns: list[list[str]], as_names: list[list[str]] = None) -> None:
         """
@@ -314,7 +354,7 @@ class TimeSeriesDataset:
         Parameters
         ----------
         `dataset_ids` : `list[int]`
-            Indexes of datasets to use in consolidation. Follows order in which the datasets 
+            0-indexed ids of datasets to use in consolidation. Follows order in which the datasets 
             were passed in `__init__`.
         `columns` : `list[list[str]]`
             2D list of column names specifying which columns to extract from which dataset. 
@@ -331,30 +371,46 @@ class TimeSeriesDataset:
         Examples
         --------
         >>> TSDataset = TimeSeriesDataset(datasets=[df1, df2], datetime_cols=['date1', 'date2'])
-        >>> TSDataset_consolidated = TSDataset.consolidate(dataset_ids=[1, 2], 
-        ...                                                columns=[
-        ...                                                    ['df1_col1', 'df1_col2', 'df1_col4'],
-        ...                                                    ['df2_col1', 'df2_col5']
-        ...                                                ])
+        >>> TSDataset.consolidate(dataset_ids=[0, 1], 
+        ...                       columns=[
+        ...                           ['df1_col1', 'df1_col2', 'df1_col4'],
+        ...                           ['df2_col1', 'df2_col5']
+        ...                       ])
         """
 
+        # check dataset ids before any work is done, ids are 0-indexed
+        for id_ in dataset_ids:
+            if not 0 <= id_ < len(self.__datasets):
+                raise ValueError(f'Dataset id "{id_}" is out of range, expected a 0-indexed id between 0 and {len(self.__datasets) - 1}.')
+
         # mend as_names
         if as_names is None:
             as_names = columns
 
-        # init return dataframe as dict
-        consolidated_df: dict[str, list[float]] = {}
+        datasets = [self.__datasets[id_] for id_ in dataset_ids]
+        consolidated_index = datasets[0].index
 
-        # iterate over datasets
-        for i, id_ in enumerate(dataset_ids):
-            dataset = self.__datasets[id_]
-            
-            # iterate over columns
-            for j, column in enumerate(columns[i]):
-                # add to consolidated dict
-                consolidated_df[as_names[i][j]] = dataset[column]
+        # init return dataframe as dict of column arrays
+        consolidated_columns: dict[str, np.ndarray] = {}
+
+        # same dates across datasets, take columns as is without aligning, copied so edits to 
+        # the datasets through apply do not reach the consolidated data
+        if all(dataset.index.equals(consolidated_index) for dataset in datasets[1:]):
+            for i, dataset in enumerate(datasets):
+                for j, column in enumerate(columns[i]):
+                    consolidated_columns[as_names[i][j]] = dataset[column].to_numpy(copy=True)
+
+        # dates missing in some datasets, align all used columns in a single concat
+        else:
+            aligned = pd.concat([dataset[columns[i]].set_axis(as_names[i], axis=1) for i, dataset in enumerate(datasets)], axis=1)
+            consolidated_index = aligned.index
 
-        self.__consolidated_data = pd.DataFrame(consolidated_df)
+            for k, name in enumerate(aligned.columns):
+                consolidated_columns[name] = aligned.iloc[:, k].to_numpy(copy=False)
+
+        self.__consolidated_columns = consolidated_columns
+        self.__consolidated_index = consolidated_index
+        self.__consolidated_data = None
 
     def set_target(self, target_col: str) -> None:
         """
@@ -379,8 +435,8 @@ class TimeSeriesDataset:
         `name` : `str`
             Name of new column.
         `data` : `pd.Series`
-            Pandas Series object with new data. Must be of the same length as the 
-            current consolidated date range.
+            Pandas Series object with new data and a datetime index. Aligned to the 
+            current consolidated date range on its index, missing dates are left as `NaN`.
 
         Raises
         ------
@@ -392,11 +448,17 @@ class TimeSeriesDataset:
         `TimeSeriesDataset.data` : Consolidated time series data
         """
             
-        # check if data has been consolidated by trying to call TimeSeriesDataset.data
-        self.data_
+        # check if data has been consolidated
+        if self.__consolidated_columns is None:
+            raise NotInitialisedError(f'{self.__class_name}.data_ has not been initialised. Call {self.__class_name}.consolidated with appropriate arguments.')
+
+        # align to consolidated dates, skipped when already aligned
+        if not data.index.equals(self.__consolidated_index):
+            data = data.reindex(self.__consolidated_index)
 
         # add new column
-        self.__consolidated_data[name] = data.values
+        self.__consolidated_columns[name] = data.to_numpy()
+        self.__consolidated_data = None
 
     def split(self, split_date: datetime, train_months: int, forecast_months: int) -> None:
         """
@@ -440,8 +502,14 @@ class TimeSeriesDataset:
         forecast_end = split_date + relativedelta(months=forecast_months)
 
         # split data while also checking if consolidated
-        train_data = self.data_.loc[(self.data_.index >= train_start) & (self.data_.index <= split_date)]
-        forecast_data = self.data_.loc[(self.data_.index > split_date) & (self.data_.index <= forecast_end)]
+        # forecast picks up right after the last train date
+        data = self._data_view()
+        train_slice = data.index.slice_indexer(train_start, split_date)
+        forecast_stop = data.index.searchsorted(forecast_end, side='right')
+
+        # copied, slices of the cached consolidated data are views of it
+        train_data = data.iloc[train_slice].copy()
+        forecast_data = data.iloc[train_slice.stop:forecast_stop].copy()
 
         # check if split data is actually at the requested date bounds
         train_days_off = (train_data.index[0] - train_start).days
@@ -481,28 +549,35 @@ class TimeSeriesDataset:
             `pd.DataFrame` if not `inplace` else `None`
         """
 
+        data = self._data_view()
+
         # check that bool mask passed is the same length as columns
-        if len(bool_mask) != len(self.data_.columns):
-            raise ValueError(f'Boolean mask ({len(bool_mask)}) and consolidated data\'s columns ({len(self.data_.columns)}) are of different lengths.')
+        if len(bool_mask) != len(data.columns):
+            raise ValueError(f'Boolean mask ({len(bool_mask)}) and consolidated data\'s columns ({len(data.columns)}) are of different lengths.')
+
+        # imported here to keep statsmodels out of package import
+        from statsmodels.tsa.stattools import adfuller
 
-        target_df = self.__consolidated_data.copy(deep=True)
+        # differenced columns collected as arrays, untouched columns are passed through
+        target_columns: dict[str, np.ndarray] = {}
 
         # iterate over columns
-        for i, column in enumerate(self.data_):
-            p_value = adfuller(self.data_[column])[1]
+        for i, column in enumerate(data.columns):
+            column_data = data[column].to_numpy(copy=False)
+            p_value = adfuller(column_data)[1]
 
             # if more than 0.05 and want to diff
-            if (force or p_value > 0.05) and bool_mask[i] is True:
-                column_data = self.data_[column]
+            if (force or p_value > 0.05) and bool_mask[i]:
+                # reuses the p-value from the check above for the first pass
+                while p_value > 0.05:
+                    # first value lost to differencing is filled with the mean
+                    column_data = np.diff(column_data)
+                    column_data = np.concatenate(([column_data.mean()], column_data))
+                    p_value = adfuller(column_data)[1]
 
-                while adfuller(column_data)[1] > 0.05:
-                    column_data = diff(column_data)
-                    column_data = [None] + column_data.tolist()
-                    column_data = pd.Series(column_data, index=self.data_.index).interpolate('time')
-                    column_data.fillna(column_data.mean(), inplace=True)
-
-                target_df[column] = column_data
+            target_columns[column] = column_data
 
         if not inplace:
-            return target_df
-        self.__consolidated_data = target_df
+            return pd.DataFrame(target_columns, index=data.index)
+        self.__consolidated_columns = target_columns
+        self.__consolidated_data = None
@@ -8,27 +8,185 @@ and not its `instances`.
 
 from __future__ import annotations
 
+import os
 import time
-from typing import Callable, Iterable, Literal
+import itertools
+import functools
+from typing import TYPE_CHECKING, Callable, Iterable, Literal
 
-import warnings; from statsmodels.tsa.base.tsa_model import ValueWarning
+# reinstalled by _arima_type once statsmodels is imported, see there
+import warnings
 warnings.filterwarnings(action='ignore', category=UserWarning)
-warnings.filterwarnings(action='ignore', category=ValueWarning)
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from statsmodels.tsa.arima.model import ARIMA, ARIMAResults
-from sklearn.metrics import mean_absolute_percentage_error, mean_absolute_error, r2_score
+from joblib import Parallel, Memory, delayed, effective_n_jobs
 
 from amara.visuals.progress import SingleProgressBar
 
+# statsmodels and sklearn are imported where used, keeps them out of module import
+if TYPE_CHECKING:
+    from statsmodels.tsa.arima.model import ARIMA, ARIMAResults
+
+
+@functools.cache
+def _arima_type() -> type[ARIMA]:
+    """
+    Imports and returns statsmodels' `ARIMA`. On import statsmodels puts "always" filters for its 
+    warnings, e.g. `ConvergenceWarning`, in front of this module's filter, so the `UserWarning` 
+    filter is reinstalled in front of them, once per process.
+    """
+
+    from statsmodels.tsa.arima.model import ARIMA
+    warnings.filterwarnings(action='ignore', category=UserWarning)
+    return ARIMA
+
+
+@functools.cache
+def _fused_metrics() -> tuple[Callable, Callable, Callable]:
+    """
+    Returns the `sklearn.metrics` MAE, MAPE and r2 score functions `_fused_scores` computes together.
+    """
+
+    from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error, r2_score
+    return mean_absolute_error, mean_absolute_percentage_error, r2_score
+
+
+def _fused_scores(y_true: pd.Series, y_pred: pd.Series, positions: tuple[int, ...], y_true_values: np.ndarray, y_true_floor: np.ndarray, ss_tot: float) -> list[float]:
+    """
+    Computes MAE, MAPE and r2 score together from one set of residuals, same as their 
+    `sklearn.metrics` functions, and returns them in the order of `positions` into 
+    `_fused_metrics`. `y_true_values`, `y_true_floor` and `ss_tot` are precomputed from 
+    `y_true` by `_make_scorer`.
+    """
+
+    y_pred = y_pred.to_numpy(dtype=np.float64)
+
+    # same input validation as sklearn
+    if not (np.isfinite(y_true_values).all() and np.isfinite(y_pred).all()):
+        raise ValueError('Input contains NaN, infinity or a value too large for dtype(\'float64\').')
+
+    residuals = y_true_values - y_pred
+    abs_residuals = np.abs(residuals)
+
+    mae = abs_residuals.mean()
+    mape = (abs_residuals / y_true_floor).mean()
+
+    # r2 score falls back to 1 or 0 like sklearn when the target is constant
+    ss_res = residuals @ residuals
+    if ss_tot != 0:
+        r2 = 1 - ss_res / ss_tot
+    else:
+        r2 = 1.0 if ss_res == 0 else 0.0
+
+    scores = (mae, mape, r2)
+    return [float(scores[position]) for position in positions]
+
+
+def _metric_scores(y_true: pd.Series, y_pred: pd.Series, metrics: tuple[Callable[[Iterable, Iterable], Iterable], ...]) -> list[float]:
+    """
+    Scores `y_pred` against `y_true` with each of `metrics`.
+    """
+
+    return [metric(y_true, y_pred) for metric in metrics]
+
+
+def _make_scorer(metrics: list[Callable[[Iterable, Iterable], Iterable]], y_true: pd.Series) -> Callable[[pd.Series, pd.Series], list[float]]:
+    """
+    Builds the scorer for a search once from its fixed `metrics` and train target `y_true`. If all 
+    `metrics` are MAE, MAPE or r2 score, they are computed together from one set of residuals with 
+    the parts depending only on `y_true` computed here, otherwise each metric is called. Partials 
+    of module level functions, so scorers pickle by reference to `joblib` workers.
+    """
+
+    fused = _fused_metrics()
+    if all(metric in fused for metric in metrics):
+        y_true_values = y_true.to_numpy(dtype=np.float64)
+        return functools.partial(
+            _fused_scores, 
+            positions=tuple(fused.index(metric) for metric in metrics),
+            y_true_values=y_true_values,
+            y_true_floor=np.maximum(np.abs(y_true_values), np.finfo(np.float64).eps),
+            ss_tot=((y_true_values - y_true_values.mean()) ** 2).sum()
+        )
+    return functools.partial(_metric_scores, metrics=tuple(metrics))
+
+
+def _fit_arima(train_target: pd.Series, train_exog: pd.DataFrame | np.ndarray, order: tuple[int, int, int], fast_fit: bool = False) -> ARIMAResults:
+    """
+    Builds and fits an ARIMA model of `order`. Kept separate so fits can be cached on disk 
+    with `joblib.Memory`, keyed on the training data, `order` and `fast_fit`. `fast_fit` 
+    uses a low-memory state space fit without parameter covariance or enforced 
+    stationarity and invertibility, meant for scoring during searches only.
+    """
+
+    ARIMA = _arima_type()
+
+    # differencing is left to statsmodels per order, fitting a pre-differenced target with d=0 
+    # would put predictions, bounds and metrics on the differenced scale instead, and sharing 
+    # one differenced series per d would need inverting for every forecast
+    if fast_fit:
+        model = ARIMA(train_target, exog=train_exog, order=order, freq='D', enforce_invertibility=False, enforce_stationarity=False)
+        return model.fit(method='statespace', low_memory=True, cov_type='none')
+
+    model = ARIMA(train_target, exog=train_exog, order=order, freq='D', enforce_invertibility=True, enforce_stationarity=True)
+
+    # always a cold start, with exog statsmodels fits through GLS which passes its own
+    # start_params to innovations_mle and rejects a second one
+    # the innovations recursion itself runs in statsmodels' compiled `_arma_innovations` 
+    # extension, so there is no python inner loop left here to jit
+    return model.fit(method='innovations_mle')
+
+
+def _fit_order(order: tuple[int, int, int], train_target: pd.Series, train_exog: np.ndarray, forecast_exog: np.ndarray, forecast_length: int, scorer: Callable[[pd.Series, pd.Series], list[float]], bounds: tuple[int, int] = None, memory: Memory = None, fast_fit: bool = False) -> tuple[tuple[int, int, int], ARIMAResults | None, list[float] | None]:
+    """
+    Fits and scores a single ARIMA `order` for `ARIMAWrapper.exhaustive_search`. Kept at module 
+    level so it can be dispatched to `joblib` workers. Returns the fitted model and its scores from 
+    `scorer` on the train part, or `None` for both if fitting or scoring failed or forecasts fell outside 
+    `bounds`.
+    """
+
+    # in case of ARIMA fitting or metric error
+    try:
+        # build and fit model, reusing a cached fit if available, warning filters are set up 
+        # here too as cached fits skip _fit_arima
+        _arima_type()
+        fit_arima = _fit_arima if memory is None else memory.cache(_fit_arima)
+        model_fit = fit_arima(train_target, train_exog, order, fast_fit)
+
+        # get predictions
+        insample_pred = model_fit.predict()
+        outsample_fc = model_fit.get_forecast(forecast_length, exog=forecast_exog)
+        
+        if bounds is not None:
+            # check if values are out of bounds, per part to skip concatenating them
+            for pred_values in (insample_pred.to_numpy(copy=False), outsample_fc.predicted_mean.to_numpy(copy=False)):
+                if pred_values.size and (np.nanmin(pred_values) < bounds[0] or np.nanmax(pred_values) > bounds[1]):
+                    raise Exception
+
+        # get model metrics based on train part
+        scores = scorer(train_target, insample_pred)
+
+        return order, model_fit, scores
+
+    except Exception:
+        return order, None, None
+
+
+def _supersedes_any(order: tuple[int, int, int], failed_orders: set[tuple[int, int, int]]) -> bool:
+    """
+    Whether `order` has the same `d` and `p` and `q` values at least as high as any of `failed_orders`.
+    """
+
+    return any(order[0] >= p and order[1] == d and order[2] >= q for p, d, q in failed_orders)
+
 
 class ARIMAWrapper:
     """
     Wrapper for the `ARIMA` class and its functionality provided by `statsmodels.tsa.arima.model`.
     """
 
-    def __init__(self, train: pd.DataFrame, forecast: pd.DataFrame, target: str) -> None:
+    def __init__(self, train: pd.DataFrame, forecast: pd.DataFrame, target: str, cache_dir: os.PathLike = None) -> None:
         """
         Creates an instance of `ARIMAWrapper`. Wraps the `ARIMA` class and provides
         extra functionality surrounding it. `train` and `forecast` must both have a 
@@ -43,10 +201,14 @@ class ARIMAWrapper:
             Forecast data including exogenous variables.
         `target` : `str`
             Target of the forecasting. 
+        `cache_dir` : `os.PathLike`, `default=None`
+            Directory to cache fitted models in with `joblib.Memory`, so repeated searches and 
+            reconstructions on the same data skip refitting. `None` to disable caching.
         """
         
         self.__train = train
         self.__forecast = forecast
+        self.__memory = Memory(cache_dir, verbose=0)
 
         self.__train_target = train[target]
         self.__train_exog = train.drop(target, axis=1)
@@ -58,6 +220,11 @@ class ARIMAWrapper:
             self.__forecast_target = None
             self.__forecast_exog = forecast
 
+        # exog as contiguous arrays for repeated fits, skips statsmodels' per-fit DataFrame handling
+        self.__train_exog_values = np.ascontiguousarray(self.__train_exog.to_numpy(dtype=np.float64))
+        self.__forecast_exog_values = np.ascontiguousarray(self.__forecast_exog.to_numpy(dtype=np.float64))
+        self.__forecast_length = len(forecast)
+
     @property
     def target(self) -> pd.Series:
         """
@@ -75,7 +242,7 @@ class ARIMAWrapper:
         Returns the length of the forecast period in days
         """
 
-        return len(self.__forecast)
+        return self.__forecast_length
     
     @property
     def forecast_exog(self) -> pd.DataFrame:
@@ -86,7 +253,7 @@ class ARIMAWrapper:
 
         return self.__forecast_exog
 
-    def exhaustive_search(self, p_values: list[int], d_values: list[int], q_values: list[int], metrics: list[Callable[[Iterable, Iterable], Iterable]], bounds: tuple[int, int] = None, return_models: bool = False) -> pd.DataFrame | tuple[pd.DataFrame, dict[tuple[int, int, int], ARIMAResults]]:
+    def exhaustive_search(self, p_values: list[int], d_values: list[int], q_values: list[int], metrics: list[Callable[[Iterable, Iterable], Iterable]], bounds: tuple[int, int] = None, return_models: bool = False, prune_supersets: bool = False, prune_differencing: bool = False, fast_fit: bool = False, n_jobs: int = -1) -> pd.DataFrame | tuple[pd.DataFrame, dict[tuple[int, int, int], ARIMAResults]]:
         """
         Exhaustively searches through the p, d and q value hyperparameters for the ARIMA 
         model and returns a DataFrame of passed models. Scores models based on their mean 
@@ -109,18 +276,42 @@ class ARIMAWrapper:
         `return_models` : `bool`, `default=False`
             Controls whether passed models are returned together with the results dataframe as a 
             tuple.
+        `prune_supersets` : `bool`, `default=False`
+            Skips orders with the same `d` and `p` and `q` values at least as high as an order that 
+            already failed, counting them as failures. A single failed `(0, d, 0)` skips its whole 
+            `d`, only pass `True` for quick searches where that is acceptable.
+        `prune_differencing` : `bool`, `default=False`
+            Runs the `adfuller` test on the train target once and only searches `d` values that 
+            agree with it, `0` if the target is already stationary and above `0` otherwise.
+        `fast_fit` : `bool`, `default=False`
+            Fits orders with a low-memory state space fit that skips parameter covariance and 
+            stationarity and invertibility enforcement, out of bounds forecasts are still rejected 
+            through `bounds`. Faster, but may rank orders differently and returned models will not 
+            match `ARIMAWrapper.reconstruct`, which always uses the normal fit.
+        `n_jobs` : `int`, `default=-1`
+            Number of worker processes fitting orders in parallel, follows `joblib` conventions 
+            where `-1` uses all cores and `1` fits orders one by one in the current process.
 
         Returns
         -------
         `pd.DataFrame`
-            DataFrame of passed models and their metrics.
+            DataFrame of passed models and their metrics, with an `Order` column and one column per 
+            metric even if no models passed.
         `dict[tuple[int, int, int], ARIMAResults]`
             if `return_models` is `True`, returns trained models.
         """
 
-        # init progress tracker
+        # drop differencing counts the train target's stationarity rules out
+        if prune_differencing:
+            from statsmodels.tsa.stattools import adfuller
+            is_stationary = adfuller(self.__train_target)[1] <= 0.05
+            d_values = [d for d in d_values if (d == 0) == is_stationary]
+
+        # init progress tracker, redrawn at most 100 times however large the grid
         steps_count = len(p_values) * len(d_values) * len(q_values)
-        tracker = SingleProgressBar(steps_count, bar_length=100)
+        tracker_steps = min(steps_count, 100)
+        tracker = SingleProgressBar(tracker_steps, bar_length=100)
+        tracker_updates = 0
         passes, failures = 0, 0
 
         # passed models
@@ -131,47 +322,57 @@ class ARIMAWrapper:
         # track time taken
         start = time.perf_counter()
 
-        # exhaustive search over values
-        for p in p_values:
-            for d in d_values:
-                for q in q_values:
-                    
-                    # in case of ARIMA fitting error
-                    try:
-                        # build model
-                        model = ARIMA(self.__train_target, exog=self.__train_exog, order=(p, d, q), freq='D', enforce_invertibility=True, enforce_stationarity=True)
-                        model_fit = model.fit(method='innovations_mle')
-
-                        # get predictions
-                        insample_pred = model_fit.predict()
-                        outsample_fc = model_fit.get_forecast(len(self.__forecast), exog=self.__forecast_exog)
-                        full_pred = pd.concat([insample_pred, outsample_fc.predicted_mean])
-                        
-                        if bounds is not None:
-                            # check if values <0 or >100
-                            if full_pred.apply(lambda x: True if x < bounds[0] or x > bounds[1] else False).any():
-                                raise Exception
-                        
-                        # get model metrics based on train part
-                        model_results = [(p, d, q)]
-                        for metric in metrics:
-                            model_results.append(metric(self.__train_target, insample_pred))
-
-                        # return models if requested
-                        if return_models:
-                            models[(p, d, q)] = model_fit
-                        
-                        orders.append(model_results)
-                        passes += 1
-
-                    except Exception:
-                        failures += 1
-
+        # exhaustive search over values, fitted in parallel one batch of workers at a time
+        grid = list(itertools.product(p_values, d_values, q_values))
+        batch_size = effective_n_jobs(n_jobs)
+        results: dict[tuple[int, int, int], tuple[ARIMAResults | None, list[float] | None]] = {}
+        failed_orders: set[tuple[int, int, int]] = set()
+        done = 0
+
+        # metrics and train target are fixed for the whole search, build their scorer once
+        scorer = _make_scorer(metrics, self.__train_target)
+
+        with Parallel(n_jobs=n_jobs, backend='loky') as parallel:
+            for batch_start in range(0, steps_count, batch_size):
+                batch = grid[batch_start:batch_start + batch_size]
+                done += len(batch)
+
+                # skip orders superseding one failed in an earlier batch, the grid order pass below 
+                # prunes them anyway, so this only saves fits
+                if prune_supersets:
+                    batch = [order for order in batch if not _supersedes_any(order, failed_orders)]
+
+                for order, model_fit, scores in parallel(delayed(_fit_order)(order, self.__train_target, self.__train_exog_values, self.__forecast_exog_values, self.__forecast_length, scorer, bounds, self.__memory, fast_fit) 
+                                                         for order in batch):
+                    results[order] = model_fit, scores
+                    if model_fit is None:
+                        failed_orders.add(order)
+
+                # catch tracker up with orders done so far
+                while tracker_updates < done * tracker_steps // steps_count:
                     tracker.update()
+                    tracker_updates += 1
+
+        # collect in grid order, pruning against orders failed earlier in the grid so results do not 
+        # depend on how many orders were fitted per batch
+        failed_orders = set()
+        for order in grid:
+            model_fit, scores = results.get(order, (None, None))
+            if model_fit is None or (prune_supersets and _supersedes_any(order, failed_orders)):
+                failed_orders.add(order)
+                failures += 1
+                continue
+
+            # return models if requested
+            if return_models:
+                models[order] = model_fit
+
+            orders.append([order] + scores)
+            passes += 1
 
         # print status report
         print(F'Passes: {passes} | Failures: {failures} | Time Taken: {time.perf_counter() - start:.2f}s')
-        model_results = pd.DataFrame(orders).rename(columns={0: 'Order'} | {i: metric.__name__ for i, metric in enumerate(metrics, start=1)})
+        model_results = pd.DataFrame(orders, columns=['Order'] + [metric.__name__ for metric in metrics])
 
         if return_models:
             return model_results, models
@@ -197,7 +398,7 @@ class ARIMAWrapper:
 
         # get and return predictions/forecasts
         insample_pred = model_fit.predict()
-        outsample_fc = model_fit.get_forecast(len(self.__forecast), exog=self.__forecast_exog)
+        outsample_fc = model_fit.get_forecast(self.__forecast_length, exog=self.__forecast_exog)
         full_pred = pd.concat([insample_pred, outsample_fc.predicted_mean])
 
         if forecast == 'insample':
@@ -228,14 +429,12 @@ class ARIMAWrapper:
             of an ARIMA instance.
         """
 
-        # build model
-        model = ARIMA(self.__train_target, exog=self.__train_exog, order=order, freq='D', enforce_invertibility=True, enforce_stationarity=True)
-
-        # bool to fit model or not
+        # bool to fit model or not, fits are cached if a cache directory was given
         if fit:
-            model_fit = model.fit(method='innovations_mle')
-            return model_fit
-        return model
+            return self.__memory.cache(_fit_arima)(self.__train_target, self.__train_exog, tuple(order))
+
+        # build model
+        return _arima_type()(self.__train_target, exog=self.__train_exog, order=order, freq='D', enforce_invertibility=True, enforce_stationarity=True)
     
     @classmethod
     def parse_order(cls, order: str) -> tuple[int, int, int]:
@@ -13,7 +13,7 @@ import pandas as pd
 import numpy as np
 
 
-def create_datetime_index(data: pd.DataFrame, datetime_col: str, format: str | Literal['auto'] = None, drop: bool = True) -> pd.DataFrame:
+def create_datetime_index(data: pd.DataFrame, datetime_col: str, format: str | Literal['auto'] = None, drop: bool = True, cache: bool = True, copy: bool = True) -> pd.DataFrame:
     """
     Creates a datetime index for the pandas DataFrame passed.
 
@@ -27,6 +27,11 @@ def create_datetime_index(data: pd.DataFrame, datetime_col: str, format: str | L
         Datetime format of the datetime column if passed as string, `None` if already `datetime` type.
     `drop` : `bool`, `default=True`
         Whether or not to drop the remaining datetime column.
+    `cache` : `bool`, `default=True`
+        Whether to parse each unique date string only once, passed to `pd.to_datetime`.
+    `copy` : `bool`, `default=True`
+        Whether to deep copy `data`. Pass `False` only if the caller owns `data`, the returned 
+        DataFrame then shares its column buffers with `data`.
 
     Returns
     -------
@@ -34,22 +39,22 @@ def create_datetime_index(data: pd.DataFrame, datetime_col: str, format: str | L
         Pandas DataFrame with datetime index.
     """
 
-    # call by value
-    data = data.copy(deep=True)
-
-    # parse datetime column
+    # parse datetime column, from the raw values to skip per-call Series overhead
     if format is not None:
+        values = data[datetime_col].to_numpy()
         if format == 'auto':
-            datetime_index = pd.to_datetime(data[datetime_col], infer_datetime_format=True, dayfirst=True)
+            datetime_index = pd.DatetimeIndex(pd.to_datetime(values, infer_datetime_format=True, dayfirst=True, cache=cache), freq='infer', name=datetime_col)
         else:
-            datetime_index = pd.to_datetime(data[datetime_col], format=format, dayfirst=True)
+            datetime_index = pd.DatetimeIndex(pd.to_datetime(values, format=format, dayfirst=True, cache=cache), freq='infer', name=datetime_col)
     else:
-        datetime_index = data[datetime_col]
-    
-    data.index = pd.DatetimeIndex(datetime_index, freq=datetime_index.dt.freq)
+        datetime_index = pd.DatetimeIndex(data[datetime_col], freq='infer', name=datetime_col)
+
+    # call by value, unless the caller owns data and a shallow copy is enough
+    data = data.copy(deep=copy)
+    data.index = datetime_index
 
     # drop
     if drop:
-        data.drop(datetime_col, axis=1, inplace=True)
+        del data[datetime_col]
 
     return data
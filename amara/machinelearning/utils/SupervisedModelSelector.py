@@ -1,89 +1,229 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Callable, Literal
 import time
+import functools
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
-from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
-from sklearn.base import BaseEstimator
+from amara._errors import NotInitialisedError
 
-from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
-from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
-from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor
-from sklearn.svm import SVC, SVR
-from sklearn.naive_bayes import GaussianNB
-from sklearn.linear_model import LogisticRegression, SGDClassifier, SGDRegressor, ElasticNet, BayesianRidge
+# sklearn is imported where used, estimators only for the goal picked, keeps it out of module import
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+    from sklearn.compose import ColumnTransformer
+    from sklearn.base import BaseEstimator
 
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.metrics import mean_absolute_error, mean_squared_error, mean_absolute_percentage_error, r2_score
+
+def _classification_defaults() -> tuple[list[BaseEstimator], list]:
+    """
+    Returns the default classification models and metrics.
+    """
+
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.svm import SVC
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+
+    models = [KNeighborsClassifier(), DecisionTreeClassifier(), RandomForestClassifier(), GradientBoostingClassifier(), LogisticRegression(), GaussianNB(), SGDClassifier(), SVC()]
+    return models, [accuracy_score, precision_score, recall_score, f1_score]
+
+
+def _regression_defaults() -> tuple[list[BaseEstimator], list]:
+    """
+    Returns the default regression models and metrics.
+    """
+
+    from sklearn.neighbors import KNeighborsRegressor
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.svm import SVR
+    from sklearn.linear_model import LogisticRegression, SGDRegressor, ElasticNet, BayesianRidge
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, mean_absolute_percentage_error, r2_score
+
+    models = [KNeighborsRegressor(), DecisionTreeRegressor(), GradientBoostingRegressor(), RandomForestRegressor(), SVR(), LogisticRegression(), SGDRegressor(), ElasticNet(), BayesianRidge()]
+    return models, [mean_absolute_error, mean_squared_error, mean_absolute_percentage_error, r2_score]
+
+
+@functools.cache
+def _confusion_metrics() -> tuple[Callable, Callable, Callable, Callable]:
+    """
+    Returns the classification metrics derivable from one confusion matrix, macro averaged 
+    where averaging applies.
+    """
+
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+    return accuracy_score, precision_score, recall_score, f1_score
+
+
+def _metric_kwargs(metric: Callable) -> dict[str, Any]:
+    """
+    Returns the keyword arguments `metric` is called with, macro averaging for precision, recall 
+    and f1 scores.
+    """
+
+    if metric in _confusion_metrics()[1:]:
+        return {'average': 'macro', 'zero_division': 0}
+    return {}
+
+
+def _confusion_scores(y_true, y_pred, metrics: list) -> list[float]:
+    """
+    Computes accuracy and macro averaged precision, recall and f1 scores from a single confusion 
+    matrix, same as their `sklearn.metrics` functions with `zero_division=0`.
+    """
+
+    from sklearn.metrics import confusion_matrix
+    from sklearn.utils.multiclass import unique_labels
+
+    accuracy_score, precision_score, recall_score, f1_score = _confusion_metrics()
+
+    cm = confusion_matrix(y_true, y_pred, labels=unique_labels(y_true, y_pred))
+    true_positives = np.diag(cm).astype(np.float64)
+    predicted = cm.sum(axis=0)
+    actual = cm.sum(axis=1)
+
+    # per class ratios, 0 where undefined
+    precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+    recall = np.divide(true_positives, actual, out=np.zeros_like(true_positives), where=actual > 0)
+    f1 = np.divide(2 * true_positives, predicted + actual, out=np.zeros_like(true_positives), where=(predicted + actual) > 0)
+
+    scores = {
+        accuracy_score: true_positives.sum() / cm.sum(),
+        precision_score: precision.mean(),
+        recall_score: recall.mean(),
+        f1_score: f1.mean()
+    }
+    return [float(scores[metric]) for metric in metrics]
+
+
+def _fit_and_score(model: BaseEstimator, X_train, X_test, y_train, y_test, metrics: list) -> tuple[BaseEstimator, list[float], float]:
+    """
+    Fits `model` on already preprocessed data and scores it on the test part. Kept at module 
+    level so it can be dispatched to `joblib` workers. Returns the fitted model, its `metrics` 
+    and the time taken to fit and predict.
+    """
+
+    # record time taken to fit
+    start = time.perf_counter()
+
+    # fit to data
+    model = model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    time_taken = time.perf_counter() - start
+
+    # get metrics, classification metrics share one confusion matrix
+    if all(metric in _confusion_metrics() for metric in metrics):
+        scores = _confusion_scores(y_test, y_pred, metrics)
+    else:
+        scores = [metric(y_test, y_pred, **_metric_kwargs(metric)) for metric in metrics]
+    return model, scores, time_taken
 
 
 class SupervisedModelSelector:
-    __classification_models = [KNeighborsClassifier(), DecisionTreeClassifier(), RandomForestClassifier(), GradientBoostingClassifier(), LogisticRegression(), GaussianNB(), SGDClassifier(), SVC()]
-    __regression_models = [KNeighborsRegressor(), DecisionTreeRegressor(), GradientBoostingRegressor(), RandomForestRegressor(), SVR(), LogisticRegression(), SGDRegressor(), ElasticNet(), BayesianRidge()]
+    """
+    Fits and scores a set of default or passed `sklearn` models on the same data to compare them.
+
+    Attributes
+    ----------
+    `fitted_models_` : `list[BaseEstimator]`
+        Fitted copies of the models from the last call to `SupervisedModelSelector.get_model_results`.
+    """
 
-    __classification_metrics = [accuracy_score, precision_score, recall_score, f1_score]
-    __regression_metrics = [mean_absolute_error, mean_squared_error, mean_absolute_percentage_error, r2_score]
+    def __init__(self, *, goal: Literal['classification', 'regression'], preprocessor: Pipeline | ColumnTransformer = None, n_jobs: int = -1) -> None:
+        """
+        Creates an instance of `SupervisedModelSelector`.
+
+        Parameters
+        ----------
+        `goal` : `Literal['classification', 'regression']`
+            Picks the default models and metrics.
+        `preprocessor` : `Pipeline | ColumnTransformer`, `default=None`
+            Fit once on the train data, its outputs are shared by all models. `None` to use the 
+            data as is.
+        `n_jobs` : `int`, `default=-1`
+            Number of worker processes fitting models in parallel, follows `joblib` conventions 
+            where `-1` uses all cores. Models with their own `n_jobs` parameter are fit with it 
+            set to 1.
+        """
 
-    def __init__(self, *, goal: Literal['classification', 'regression'], preprocessor: Pipeline | ColumnTransformer = None) -> None:
         # load valid models
         if goal == 'classification':
-            self.__models = self.__classification_models
-            self.__metrics = self.__classification_metrics
+            self.__models, self.__metrics = _classification_defaults()
         elif goal == 'regression':
-            self.__models = self.__regression_models
-            self.__metrics = self.__regression_metrics
+            self.__models, self.__metrics = _regression_defaults()
         else:
             raise ValueError(f'Keyword argument "goal" must be either "classification" or "regression", got "{goal}" instead.')
         
         # load preprocessor
         self.__preprocessor = preprocessor
 
+        # models are fit in parallel processes, each model's own n_jobs is set to 1 when fitting
+        self.__n_jobs = n_jobs
+        self.__fitted_models: list[BaseEstimator] = None
+
         # storage for selection
         self.__best_base_model = None
         self.__best_base_model_scores = None
         
-    def get_model_results(self, X_train, X_test, y_train, y_test, *, models: list[BaseEstimator] = None) -> pd.DataFrame:
+    @property
+    def fitted_models_(self) -> list[BaseEstimator]:
         """
-        
+        Fitted copies of the models from the last call to `SupervisedModelSelector.get_model_results`, 
+        in the same order as the models used.
+
+        Raises
+        ------
+        `NotInitialisedError`:
+            Only available after call to `SupervisedModelSelector.get_model_results`.
         """
 
-        # get models
+        if self.__fitted_models is None:
+            raise NotInitialisedError(f'{type(self).__name__}.fitted_models_ has not been initialised. Call {type(self).__name__}.get_model_results with appropriate arguments.')
+
+        return self.__fitted_models
+
+    def get_model_results(self, X_train, X_test, y_train, y_test, *, models: list[BaseEstimator] = None, metrics: list = None) -> pd.DataFrame:
+        """
+        Fits and scores `models` in parallel. Unfitted copies of `models` are fitted, the `models` 
+        passed are left as is and their fitted copies kept in `SupervisedModelSelector.fitted_models_`.
+        """
+
+        # get models and metrics
         if models is None:
             models = self.__models
+        if metrics is None:
+            metrics = self.__metrics
 
         # results as dataframe
         results_df: dict[str, str | float] = {}
 
-        # iterate over models
-        for i, model in enumerate(models):
-            # build pipeline with model
-            pipeline = Pipeline([
-                ('preprocessor', self.__preprocessor),
-                ('estimator', model)
-            ])
+        # fit preprocessor once and share its outputs across all models
+        if self.__preprocessor is not None:
+            X_train = self.__preprocessor.fit_transform(X_train, y_train)
+            X_test = self.__preprocessor.transform(X_test)
 
-            # skip model if unable to train/fit/get metrics
-            try:
-                # record time taken to fit
-                start = time.perf_counter()
+        # fit unfitted copies, single threaded where supported to avoid oversubscribing cores
+        from sklearn.base import clone
 
-                # fit to data
-                pipeline = pipeline.fit(X_train, y_train)
-                y_pred = pipeline.predict(X_test)
-                time_taken = time.perf_counter() - start
+        fit_models = [clone(model) for model in models]
+        for model in fit_models:
+            if 'n_jobs' in model.get_params():
+                model.set_params(n_jobs=1)
 
-                # get metrics
-                metrics = [str(model)] + [metric(y_test, y_pred, average='macro') for metric in self.__metrics] + [f'{time_taken:.2f}s']
-                results_df[i] = metrics
+        # fit and score models in parallel, errors are raised as is
+        results = Parallel(n_jobs=self.__n_jobs, backend='loky')(
+            delayed(_fit_and_score)(model, X_train, X_test, y_train, y_test, metrics) for model in fit_models
+        )
 
-            except Exception as e:
-                raise e
-            
+        self.__fitted_models = []
+        for i, (fitted, scores, time_taken) in enumerate(results):
+            self.__fitted_models.append(fitted)
+            results_df[i] = [str(models[i])] + scores + [f'{time_taken:.2f}s']
 
         return results_df
-
-            
\ No newline at end of file
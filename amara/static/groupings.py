@@ -5,8 +5,13 @@ in a column to another value.
 """
 
 
+from __future__ import annotations
+
 import math
 
+import numpy as np
+import pandas as pd
+
 room_types = {
     'Deluxe': ['DLXT', 'DLXK'],
     'Executive': ['EXET', 'EXEK'],
@@ -53,4 +58,99 @@ taxes = {
     1.177: (-math.inf, 2022),
     1.188: (2023, 2023),
     1.199: (2024, math.inf)
-}
\ No newline at end of file
+}
+
+def _bin_edges(bins: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sorts `bins` of `label: (low, high)` by their bounds into arrays of lower edges, upper 
+    edges and labels.
+    """
+
+    labels, bounds = zip(*sorted(bins.items(), key=lambda item: item[1]))
+    lows, highs = zip(*bounds)
+    return np.array(lows, dtype=np.float64), np.array(highs, dtype=np.float64), np.array(labels)
+
+
+# sorted bin edges and labels, built once at import
+_nights_lows, _nights_highs, _nights_labels = _bin_edges(nights_bins)
+_booking_window_lows, _booking_window_highs, _booking_window_labels = _bin_edges(booking_window_bins)
+_taxes_lows, _taxes_highs, _taxes_labels = _bin_edges(taxes)
+
+
+def bin_lookup(values: np.ndarray, lows: np.ndarray, highs: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """
+    Bins `values` into the first bin, in sorted order, whose inclusive `lows` and `highs` 
+    bounds contain it, same as checking `low <= value <= high` for each bin in order. Values 
+    in no bin, e.g. `NaN`, out of range or between whole number bins, are labelled `NaN`.
+
+    Parameters
+    ----------
+    `values` : `np.ndarray`
+        Numbers to bin.
+    `lows` : `np.ndarray`
+        Lower edges of the bins, inclusive.
+    `highs` : `np.ndarray`
+        Sorted upper edges of the bins, inclusive.
+    `labels` : `np.ndarray`
+        Label of each bin, parallel to `lows` and `highs`.
+
+    Returns
+    -------
+    `np.ndarray`
+        Label of each value in `values`, `float` if `labels` are floats and `object` otherwise.
+
+    Examples
+    --------
+    >>> bin_nights(np.array([-3, 0, 2, 2.5, 7, 15, np.nan]))
+    array([nan, 'Dayuse', '2 days', nan, '7 - 14 days', '> 14 days', nan],
+          dtype=object)
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+
+    # first bin whose upper edge is not below the value, NaN sorts past the last edge
+    index = np.searchsorted(highs, values, side='left')
+    clipped = np.minimum(index, highs.size - 1)
+    matched = (index < highs.size) & (lows[clipped] <= values)
+
+    # object labels so NaN is kept as is rather than cast to a string
+    if labels.dtype.kind != 'f':
+        labels = labels.astype(object)
+    return np.where(matched, labels[clipped], np.nan)
+
+
+def bin_nights(values: np.ndarray) -> np.ndarray:
+    """
+    Bins numbers of nights stayed into the labels of `nights_bins`.
+    """
+
+    return bin_lookup(values, _nights_lows, _nights_highs, _nights_labels)
+
+
+def bin_booking_window(values: np.ndarray) -> np.ndarray:
+    """
+    Bins booking windows in days into the labels of `booking_window_bins`.
+    """
+
+    return bin_lookup(values, _booking_window_lows, _booking_window_highs, _booking_window_labels)
+
+
+def tax_for_year(years: np.ndarray) -> np.ndarray:
+    """
+    Returns the tax multiplier of `taxes` applicable to each of `years`.
+    """
+
+    return bin_lookup(years, _taxes_lows, _taxes_highs, _taxes_labels)
+
+
+# inverted lookups of code to group, built once at import
+CODE_TO_ROOM_TYPE = {code: name for name, codes in room_types.items() for code in codes}
+BREAKFAST_PRICE_BY_CODE = {code: price for price, codes in breakfast_groups.items() for code in codes}
+
+
+def room_type_for(codes: pd.Series) -> pd.Series:
+    """
+    Maps room type codes to their room type in `room_types`, `NaN` for unknown codes.
+    """
+
+    return codes.map(CODE_TO_ROOM_TYPE)
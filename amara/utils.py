@@ -7,8 +7,87 @@ functions/classes, used to introduce just a bit more modularity.
 from __future__ import annotations
 
 import os
+import re
 from typing import Any
-from configparser import ConfigParser
+from configparser import DEFAULTSECT, NoSectionError
+
+
+# parsed config files by absolute filepath, as (modified time, size, sections, all sections merged), 
+# shared by all ConfigFile instances
+_CACHE: dict[str, tuple[int, int, dict[str, dict[str, str]], dict[str, str]]] = {}
+
+
+class FastConfigParser:
+    """
+    This class provides a lightweight parser for simple config files of `[section]` headers 
+    and `key = value` (or `key: value`) lines, parsed with 2 regular expressions in a single
+    read. Keys are lowercased and `DEFAULT` section values apply to every section, same as 
+    `ConfigParser`, but values are not interpolated and cannot span multiple lines.
+    """
+
+    _SECTION_RE = re.compile(r'^\[([^\]\n]+)\][ \t]*$', re.M)
+    _KV_RE = re.compile(r'^([^=:;#\s][^=:\n]*?)[ \t]*[=:][ \t]*(.*?)[ \t]*$', re.M)
+
+    def __init__(self) -> None:
+        """
+        Instantiates an instance of `FastConfigParser`.
+        """
+
+        self.__defaults: dict[str, str] = {}
+        self.__sections: dict[str, dict[str, str]] = {}
+
+    def read(self, filepath: os.PathLike) -> None:
+        """
+        Reads and parses the config file at `filepath`, missing files are skipped like 
+        `ConfigParser.read`.
+
+        Parameters
+        ----------
+        `filepath` : `os.PathLike`
+            Filepath to the config file.
+        """
+
+        try:
+            with open(filepath) as file:
+                text = file.read()
+        except FileNotFoundError:
+            return
+
+        # [preamble, name_1, body_1, name_2, body_2, ...]
+        parts = self._SECTION_RE.split(text)
+        for name, body in zip(parts[1::2], parts[2::2]):
+            options = {key.lower(): value for key, value in self._KV_RE.findall(body)}
+
+            if name == DEFAULTSECT:
+                self.__defaults.update(options)
+            else:
+                self.__sections.setdefault(name, {}).update(options)
+
+    def sections(self) -> list[str]:
+        """
+        Returns the names of all sections besides `DEFAULT`.
+        """
+
+        return list(self.__sections)
+
+    def items(self, section_name: str) -> dict[str, str]:
+        """
+        Returns the options in `section_name`, including `DEFAULT` section values.
+
+        Parameters
+        ----------
+        `section_name` : `str`
+            Name of the section in the config file to be accessed.
+
+        Returns
+        -------
+        `dict[str, str]`
+            Dictionary of config data.
+        """
+
+        if section_name not in self.__sections:
+            raise NoSectionError(section_name)
+        return self.__defaults | self.__sections[section_name]
 
 
 class ConfigFile:
@@ -36,9 +115,38 @@ class ConfigFile:
 
         self.__filepath = filepath
 
-        # read config file and store contents
-        self.__configparser = ConfigParser()
-        self.__configparser.read(self.__filepath)
+        # reuse the parsed file if unchanged since it was last read, missing files are never cached
+        key = os.path.abspath(self.__filepath)
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            stat = None
+
+        cached = _CACHE.get(key)
+        if stat is not None and cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            self.__sections, self.__all = cached[2:]
+            return
+
+        # read config file and store contents by section
+        configparser = FastConfigParser()
+        configparser.read(self.__filepath)
+        self.__sections = {section: configparser.items(section) for section in configparser.sections()}
+
+        # all sections merged once, later sections take precedence
+        self.__all: dict[str, str] = {}
+        for options in self.__sections.values():
+            self.__all.update(options)
+
+        if stat is not None:
+            _CACHE[key] = (stat.st_mtime_ns, stat.st_size, self.__sections, self.__all)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Clears the config files parsed so far, making new instances reread their file.
+        """
+
+        _CACHE.clear()
 
     @property
     def sections(self) -> list[str]:
@@ -46,11 +154,12 @@ class ConfigFile:
         Sections within the config file.
         """
 
-        return list(self.__configparser.keys())[1:]
+        return list(self.__sections)
     
     def get(self, section_name: str) -> dict[str, str]:
         """
-        Returns the config data in the `section_name` as a dictionary of string values.
+        Returns the config data in the `section_name` as a dictionary of string values, a copy 
+        of the parsed section so changes to it do not affect other `ConfigFile` instances.
 
         Parameters
         ----------
@@ -63,7 +172,9 @@ class ConfigFile:
             Dictionary of config data.
         """
 
-        return dict(self.__configparser.items(section_name))
+        if section_name not in self.__sections:
+            raise NoSectionError(section_name)
+        return dict(self.__sections[section_name])
     
     @property
     def all(self) -> dict[str, str]:
@@ -71,9 +182,4 @@ class ConfigFile:
         Returns all config data in the config file regardless of section.
         """
 
-        config_dict = {}
-
-        for section in self.sections:
-            config_dict = config_dict | self.get(section)
-
-        return config_dict
+        return dict(self.__all)
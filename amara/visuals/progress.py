@@ -7,10 +7,43 @@ to give end users an indication of the script's progress.
 from __future__ import annotations
 
 import os
-import math
-import inspect
+import re
+import sys
+import mmap
+import time
+import threading
 from typing import Literal
 
+import numpy as np
+
+
+# auto generated step counts, keyed by (caller filepath, class name, file modified time)
+_AUTO_STEPS_CACHE: dict[tuple[str, str, int], int] = {}
+
+
+def _write(text: str) -> None:
+    """
+    Writes `text` straight to the stdout file descriptor, skipping Python's text buffering. Falls
+    back to `sys.stdout.write` where stdout has no file descriptor, e.g. notebooks or redirected 
+    output, and on Windows where consoles need `sys.stdout`'s own encoding handling.
+    """
+
+    try:
+        fd = sys.stdout.fileno() if os.name == 'posix' else None
+    except (AttributeError, OSError, ValueError):
+        fd = None
+
+    if fd is None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+
+    # flush anything printed before so output stays in order
+    sys.stdout.flush()
+    data = text.encode(sys.stdout.encoding or 'utf-8')
+    while data:
+        data = data[os.write(fd, data):]
+
 
 class SingleProgressBar:
     """
@@ -59,60 +92,71 @@ class SingleProgressBar:
             # get class name to find the var name in file
             class_name = type(self).__name__
 
-            # get caller filepath
-            frame = inspect.stack()[1]
-            path = os.path.abspath(frame[0].f_code.co_filename)
+            # get caller filepath, direct frame lookup without building the whole stack
+            path = os.path.abspath(sys._getframe(1).f_code.co_filename)
 
-            var_name = None
-            steps = 0
+            # reuse the count if the file is unchanged since it was last scanned
+            key = (path, class_name, os.stat(path).st_mtime_ns)
+            if key not in _AUTO_STEPS_CACHE:
+                steps = 0
 
-            # open and read file
-            with open(path, 'r') as file:
-                # iterate over lines
-                for line in file.readlines():
-                    # find var name
-                    if var_name is None:
-                        if f'{class_name}(' in line:
-                            var_name = line.split('=')[0].rstrip()
+                # scan the memory mapped file in place, no decoding or per-line strings
+                with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    # find var name, then count uncommented [variable_name].update() lines from there
+                    match = re.search(rb'^[ \t]*([\w.]+)[ \t]*(?::[^=\n]*)?=[ \t]*' + re.escape(class_name.encode()) + rb'\(', buffer, re.M)
+                    if match is not None:
+                        update_re = re.compile(rb'^(?![ \t]*#).*(?<![\w.])' + re.escape(match.group(1)) + rb'\.update\(', re.M)
+                        steps = len(update_re.findall(buffer, match.start()))
 
-                    # check each line for [variable_name].update()
-                    if f'{var_name}.update(' in line and not line.replace(' ', '').startswith('#'):
-                        steps += 1
+                _AUTO_STEPS_CACHE[key] = steps
 
             # set auto generated step count
-            self.__steps = steps
+            self.__steps = _AUTO_STEPS_CACHE[key]
+
+        # done characters after each step, computed in one pass and kept as a list for fast indexing
+        self.__bar_progress = np.ceil((np.arange(1, self.__steps) / self.__steps) * self.__bar_length).astype(np.int64).tolist() + [self.__bar_length]
 
-        self.__bar_progress = [math.ceil((i / self.__steps) * self.__bar_length) for i in range(self.__steps)][1:] + [self.__bar_length]
-        print(f'\r{"░" * self.__bar_length}  0.00%', end='')
+        # every possible bar, indexed by its number of done characters
+        self.__bars = [f'\r{characters[1] * done}{characters[0] * (bar_length - done)}' for done in range(bar_length + 1)]
+        self.__last_drawn = -1
+
+        _write(f'\r{"░" * self.__bar_length}  0.00%')
 
     def update(self) -> None:
         """
         Increments the internal step counter of the `SingleProgressBar` object by 1. 
         Prints the next updated progress bar with the new progress visual and 
-        percentage.
+        percentage, only if the bar itself changed or on the last step.
         """
 
         # if past update point, throw warning
         if self.__current_step >= self.__steps:
             raise Exception(f'Step update exceeded steps count.')
 
-        percent_progress = 100 * (self.__current_step + 1) / self.__steps
-        done_section = f"{self.__characters[1]}" * self.__bar_progress[self.__current_step]
-        tbd_section = f"{self.__characters[0]}" * (self.__bar_length - self.__bar_progress[self.__current_step])
+        # skip redrawing an unchanged bar, the last step is always drawn
+        done = self.__bar_progress[self.__current_step]
+        if done == self.__last_drawn and self.__current_step + 1 < self.__steps:
+            self.__current_step += 1
+            return
+        self.__last_drawn = done
 
-        print(f'\r{done_section}{tbd_section} {percent_progress:.2f}%', end='')
+        percent_progress = 100 * (self.__current_step + 1) / self.__steps
+        _write(f'{self.__bars[done]} {percent_progress:.2f}%')
         self.__current_step += 1
 
         if self.__current_step == self.__steps:
-            print()
+            _write('\n')
 
 
 class MultipleProgressBar:
     """
     Created a progress bar visual that supports multiple bars and separate updating for
-    bars of different lengths
+    bars of different lengths. Updates are thread safe and redrawn at most 30 times a second,
+    a bar finishing is always redrawn.
     """
 
+    _min_interval = 1 / 30
+
     def __init__(self, names: list[str], steps: list[int], bar_length: int = 100, characters: tuple[str, str] = ('▓', '▒')) -> None:
         """
         Creates an instance of `MultipleProgressBar`.
@@ -138,12 +182,23 @@ class MultipleProgressBar:
         
         self._current_steps = [0] * len(self._names)
 
-        self._current_dones = [''] * len(self._names)
-        self._current_undones = [self._characters[1] * self._bar_length] * len(self._names)
+        # every possible bar, indexed by its number of done characters
+        self._bars = [f'{self._characters[0] * done}{self._characters[1] * (self._bar_length - len(self._characters[0] * done))}' for done in range(self._bar_length + 1)]
 
         # formatting for names
         self._name_spacing = len(max(self._names, key=len))
 
+        # borders, built once
+        self._top_border = f'┌┬{"─" * (self._name_spacing + 2)}┬{"─" * (self._bar_length + 2)}┬{"─" * 8}┬┐'
+        self._bottom_border = f'└┴{"─" * (self._name_spacing + 2)}┴{"─" * (self._bar_length + 2)}┴{"─" * 8}┴┘'
+
+        # done characters and finished flag of each bar as last drawn
+        self._last_drawn: list[tuple[int, bool]] = [None] * len(self._names)
+
+        # updates may come from multiple threads, redraws are rate limited
+        self._lock = threading.Lock()
+        self._last_render = 0.0
+
         print('\n' * (len(self._names) + 1))
         self._generate_bars()
 
@@ -153,19 +208,41 @@ class MultipleProgressBar:
 
         return all([self._current_steps[i] == steps for i, steps in enumerate(self._steps)])
 
-    def _generate_bars(self) -> None:
-        print(f'\033[{len(self._names) + 3}A')
-        print(f'┌┬{"─" * (self._name_spacing + 2)}┬{"─" * (self._bar_length + 2)}┬{"─" * 8}┬┐')
-        
-        # iterate over names
-        for i, name in enumerate(self._names):
-            # get done and undone sections
-            done_chars = round(self._current_steps[i] / self._steps[i] * self._bar_length) * self._characters[0]
-            undone_chars = (self._bar_length - len(done_chars)) * self._characters[1]
+    def _row_state(self, index: int) -> tuple[int, bool]:
+        # done characters and finished flag of a bar
+        return round(self._current_steps[index] / self._steps[index] * self._bar_length), self._current_steps[index] == self._steps[index]
 
-            print(f'││ {name: >{self._name_spacing}} │ {done_chars}{undone_chars} │ {100 * self._current_steps[i] / self._steps[i]:#.4g}% │')
+    def _render_row(self, index: int) -> str:
+        # builds a bar's row, recording it as drawn
+        self._last_drawn[index] = state = self._row_state(index)
+        return f'││ {self._names[index]: >{self._name_spacing}} │ {self._bars[state[0]]} │ {100 * self._current_steps[index] / self._steps[index]:#.4g}% │'
 
-        print(f'└┴{"─" * (self._name_spacing + 2)}┴{"─" * (self._bar_length + 2)}┴{"─" * 8}┴┘')
+    def _generate_bars(self) -> None:
+        # full redraw over the previous bars and borders
+        lines = [f'\033[{len(self._names) + 3}A', self._top_border]
+        lines.extend(self._render_row(i) for i, _ in enumerate(self._names))
+        lines.append(self._bottom_border)
+
+        # single write so redraws cannot interleave
+        _write('\n'.join(lines) + '\n')
+
+    def _render(self, force: bool = False) -> None:
+        # redraw at most once per interval unless forced
+        now = time.monotonic()
+        if not force and now - self._last_render < self._min_interval:
+            return
+        self._last_render = now
+
+        # rewrite only rows that changed visibly or just finished, moving up to each row and 
+        # back down below the bars
+        rows = []
+        for i, _ in enumerate(self._names):
+            if self._row_state(i) != self._last_drawn[i]:
+                offset = len(self._names) - i + 1
+                rows.append(f'\033[{offset}A\r{self._render_row(i)}\033[{offset}B\r')
+
+        if rows:
+            _write(''.join(rows))
 
     def update(self, index: int) -> None:
         """
@@ -177,19 +254,21 @@ class MultipleProgressBar:
             Index of bar to be updated
         """
 
-        if self._current_steps[index] >= self._steps[index]:
-            raise Exception(f'Current step ({self._current_steps[index]}) exceeded max steps ({self._steps[index]}) for bar {self._names[index]}.')
-        self._current_steps[index] += 1
+        with self._lock:
+            if self._current_steps[index] >= self._steps[index]:
+                raise Exception(f'Current step ({self._current_steps[index]}) exceeded max steps ({self._steps[index]}) for bar {self._names[index]}.')
+            self._current_steps[index] += 1
 
-        self._generate_bars()
+            self._render(force=self._current_steps[index] == self._steps[index])
 
     def update_all(self) -> None:
         """Updates all bars at once."""
 
-        for i, _ in enumerate(self._steps):
-            if self._current_steps[i] >= self._steps[i]:
-                raise Exception(f'Current step ({self._current_steps[i]}) exceeded max steps ({self._steps[i]}) for bar {self._names[i]}.')
-            self._current_steps[i] += 1
+        with self._lock:
+            for i, _ in enumerate(self._steps):
+                if self._current_steps[i] >= self._steps[i]:
+                    raise Exception(f'Current step ({self._current_steps[i]}) exceeded max steps ({self._steps[i]}) for bar {self._names[i]}.')
+                self._current_steps[i] += 1
 
-        self._generate_bars()   
+            self._render(force=any(self._current_steps[i] == steps for i, steps in enumerate(self._steps)))
     
\ No newline at end of file
@@ -7,6 +7,7 @@ messages.
 
 from __future__ import annotations
 
+import sys
 from abc import ABC, abstractmethod
 
 
@@ -24,26 +25,27 @@ class OptionsList(_IUserInput):
         self.__options = options
         self.__indent = '\t' * indent
 
+        # format prompt once, re-emitted as is on every retry
+        lines = [f'{self.__indent}{self._prompt}'] + [f'{self.__indent}\t[{i + 1}] {option}' for i, option in enumerate(self.__options)]
+        self.__rendered = '\n'.join(lines) + '\n'
+        self.__input_prompt = f'{self.__indent}>>> '
+
     def prompt(self) -> int:
         # loop for bad input
         while True:
-            # format prompt
-            print(f'{self.__indent}{self._prompt}')
-            for i, option in enumerate(self.__options):
-                print(f'{self.__indent}\t[{i + 1}] {option}')
-            choice = input(f'{self.__indent}>>> ')
+            sys.stdout.write(self.__rendered)
+            choice = input(self.__input_prompt)
 
             # input validation
             try:
-                choice = int(choice)
-                if choice < 1 or choice > len(self.__options):
-                    raise Exception
-                break
-                
-            except Exception:
-                print(f'{self.__indent}Expecting a whole number between 1 and {len(self.__options)}, got "{choice}" instead.\n')
-
-        return choice
+                number = int(choice)
+            except ValueError:
+                number = None
+
+            if number is not None and 1 <= number <= len(self.__options):
+                return number
+
+            print(f'{self.__indent}Expecting a whole number between 1 and {len(self.__options)}, got "{choice if number is None else number}" instead.\n')
     
 class YesNoPrompt(_IUserInput):
     def __init__(self, prompt: str, indent: int = 0) -> None:
@@ -100,7 +102,7 @@ class FreeIntegerInput(_IUserInput):
             
                 choices.append(choice)
 
-            except Exception:
+            except ValueError:
                 print(f'{self.__indent}Expecting a whole number between {self.__bounds[0]} and {self.__bounds[1]}, got "{choice}" instead.')
                 continue
 
@@ -25,9 +25,13 @@ Visual Studio Code editor, consider adding this:
 to your .vscode/settings.json folder in your working directory to enable syntax
 highlighting 
 """
-from importlib import reload
 import sys; sys.path.append('../amara-dev')
-import amara; reload(amara)
+import amara
+
+# reloading re-runs every amara module, only done on request when iterating on amara itself
+if os.environ.get('AMARA_DEV_RELOAD'):
+    from importlib import reload
+    reload(amara)
 
 import pandas as pd
 import numpy as np
@@ -65,6 +69,30 @@ _str_daily_path = '../Raw Data/STR_Daily'
 tracker = SingleProgressBar(steps='auto', bar_length=100)
 
 
+def Agilysis_extract_filled_data(data: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Runs `Agilysis_extract_raw_data` and fills missing values of each section with 0, done per
+    file inside the parallel jobs instead of over the merged data.
+    """
+
+    return tuple(df.fillna(0) for df in Agilysis_extract_raw_data(data))
+
+
+def concat_filled(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates already filled DataFrames, only filling columns missing from some of the
+    `parts` as those are the only gaps concatenating introduces.
+    """
+
+    df = pd.concat(parts, ignore_index=True, copy=False)
+
+    gaps = [column for column in df.columns if not all(column in part.columns for part in parts)]
+    if gaps:
+        df[gaps] = df[gaps].fillna(0)
+
+    return df
+
+
 def main():
     """
     Main script file, denoted by the function name "main" and called at the end of 
@@ -78,13 +106,13 @@ def main():
     """Agilysis Files [Raw Data/Agilysis/*.xlsx]"""
     # extract and process file data
     agilysis_filepaths = DirectoryWrapper(_agilysis_path).files
-    dfs: list[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]] = Parallel(n_jobs=-1, verbose=0)(delayed(processor_loop)(filepath, None, Agilysis_extract_raw_data) for filepath in agilysis_filepaths)
+    dfs: list[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]] = Parallel(n_jobs=-1, verbose=0)(delayed(processor_loop)(filepath, None, Agilysis_extract_filled_data) for filepath in agilysis_filepaths)
 
-    # Agilysis_extract_raw_data returns a tuple of 3 dfs, separate
-    dfs = np.array(dfs, dtype=object)
-    revenue_df = pd.concat(dfs[:, 0]).reset_index(drop=True).fillna(0)
-    settlement_df = pd.concat(dfs[:, 1]).reset_index(drop=True).fillna(0)
-    department_df = pd.concat(dfs[:, 2]).reset_index(drop=True).fillna(0)
+    # Agilysis_extract_filled_data returns a tuple of 3 filled dfs, separate
+    revenue_parts, settlement_parts, department_parts = zip(*dfs)
+    revenue_df = concat_filled(revenue_parts)
+    settlement_df = concat_filled(settlement_parts)
+    department_df = concat_filled(department_parts)
 
     ExcelFileWrapper('aaa.xlsx').save_multiple(datas=[revenue_df, settlement_df, department_df], sheet_names=['Revenue', 'Settlement', 'Department'])
     tracker.update()